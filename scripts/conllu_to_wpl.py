@@ -28,56 +28,74 @@ Output format (tabular with sentence markers):
 Note: multi-word token lines (ID like "1-2") and empty node lines (ID like "1.1")
 are dropped since they are not real tokens.
 
+Lines are processed as raw bytes (no UTF-8 decoding) since only the ASCII ID
+column and line structure are inspected; token data is copied through as is.
+
 Usage:
     python scripts/conllu_to_wpl.py input.conllu output_s.conllu
 """
 
 import sys
-import re
+
+# I/O buffer size for reading/writing large CoNLL-U files
+BUFFER_SIZE = 1 << 20  # 1 MiB
 
 
 def convert(input_path: str, output_path: str) -> tuple[int, int]:
     """Convert CoNLL-U to WPL with <s> markers. Returns (sentence_count, token_count)."""
-    mwt_or_empty = re.compile(r'^\d+-\d+\t|^\d+\.\d+\t')
     sentences = 0
     tokens = 0
     in_sentence = False
+    # Output is accumulated here and written in BUFFER_SIZE chunks, which is
+    # much cheaper than one fout.write() call per token line
+    outbuf = bytearray()
 
-    with open(input_path, encoding='utf-8', errors='replace') as fin, \
-         open(output_path, 'w', encoding='utf-8') as fout:
+    with open(input_path, 'rb', buffering=BUFFER_SIZE) as fin, \
+         open(output_path, 'wb', buffering=BUFFER_SIZE) as fout:
 
         for line in fin:
-            line = line.rstrip('\n')
+            line = line.rstrip(b'\r\n')
 
             # Skip comment lines
-            if line.startswith('#'):
+            if line.startswith(b'#'):
                 continue
 
             # Blank line = sentence boundary
             if not line.strip():
                 if in_sentence:
-                    fout.write('</s>\n')
+                    outbuf += b'</s>\n'
                     sentences += 1
                     in_sentence = False
                 continue
 
-            # Skip multi-word tokens ("1-2\t...") and empty nodes ("1.1\t...")
-            if mwt_or_empty.match(line):
-                continue
+            # Skip multi-word tokens ("1-2\t...") and empty nodes ("1.1\t...");
+            # the ID column is a short ASCII field, so a byte scan is enough
+            tab = line.find(b'\t', 0, 16)
+            if tab > 0:
+                token_id = line[:tab]
+                if b'-' in token_id or b'.' in token_id:
+                    continue
 
             # Normal token line — open sentence if needed
             if not in_sentence:
-                fout.write('<s>\n')
+                outbuf += b'<s>\n'
                 in_sentence = True
 
-            fout.write(line + '\n')
+            outbuf += line
+            outbuf += b'\n'
             tokens += 1
 
+            if len(outbuf) >= BUFFER_SIZE:
+                fout.write(outbuf)
+                outbuf.clear()
+
         # Close final sentence if file doesn't end with a blank line
         if in_sentence:
-            fout.write('</s>\n')
+            outbuf += b'</s>\n'
             sentences += 1
 
+        fout.write(outbuf)
+
     return sentences, tokens
 
 
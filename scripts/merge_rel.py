@@ -1,6 +1,9 @@
 import json
+import sys
 from collections import Counter
 
+_MISSING = object()
+
 path=r'd:\\git\\concept-sketch\\grammars\\relations.json'
 with open(path,'r',encoding='utf-8') as f:
     data=json.load(f)
@@ -14,18 +17,18 @@ for r in rels:
         order.append(id)
     else:
         existing=merged[id]
-        # combine fields
+        # combine fields in one pass; later entry takes precedence and a
+        # differing earlier value is kept once under 'bcql_<key>'
         for k,v in r.items():
             if k=='id': continue
-            if k not in existing:
+            old=existing.get(k,_MISSING)
+            if old is _MISSING:
+                existing[k]=v
+            elif old!=v:
+                existing.setdefault('bcql_'+k,old)
                 existing[k]=v
-            else:
-                if existing[k]!=v:
-                    bcqk='bcql_'+k
-                    if bcqk not in existing:
-                        existing[bcqk]=existing[k]
-        # later entry takes precedence
-        existing.update(r)
 newrels=[merged[id] for id in order]
 out={'version':data.get('version'),'description':data.get('description'),'bcql':data.get('bcql'),'relations':newrels}
-print(json.dumps(out, indent=2, ensure_ascii=False))
+# stream straight to stdout instead of building the whole string first
+json.dump(out, sys.stdout, indent=2, ensure_ascii=False)
+sys.stdout.write('\n')
@@ -14,8 +14,11 @@ Requirements:
 
 import argparse
 import gc
+import queue
 import stanza
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import torch
 
@@ -65,6 +68,43 @@ def stream_units(input_path: Path, paragraph_mode: bool = False):
                 yield '\n'.join(buf)
 
 
+def stream_chunks(input_path: Path, paragraph_mode: bool, chunk_size: int):
+    """Group the units from stream_units() into lists of up to chunk_size."""
+    chunk = []
+    for unit in stream_units(input_path, paragraph_mode):
+        chunk.append(unit)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def prefetch(items, depth: int = 4):
+    """Iterate over items produced by a background thread, at most depth ahead.
+
+    Lets input reading overlap with GPU work in the consumer. An exception
+    raised while producing items is re-raised in the consumer.
+    """
+    q = queue.Queue(maxsize=depth)
+    done = object()
+    errors = []
+
+    def produce():
+        try:
+            for item in items:
+                q.put(item)
+        except BaseException as e:
+            errors.append(e)
+        finally:
+            q.put(done)
+
+    threading.Thread(target=produce, daemon=True).start()
+    while (item := q.get()) is not done:
+        yield item
+    if errors:
+        raise errors[0]
+
 
 def main():
     parser = argparse.ArgumentParser(
@@ -114,11 +154,16 @@ def main():
         action='store_true',
         help='Input uses blank-line-separated paragraphs instead of one sentence per line'
     )
+    parser.add_argument(
+        '--no-ssplit',
+        action='store_true',
+        help='Input is already one sentence per line: skip sentence splitting (tokenize_no_ssplit)'
+    )
     parser.add_argument(
         '--chunk-size',
         type=int,
         default=5000,
-        help='Number of lines/paragraphs to batch together per nlp() call (default: 5000)'
+        help='Number of lines/paragraphs to batch together per bulk_process() call (default: 5000)'
     )
     parser.add_argument(
         '--heartbeat',
@@ -128,6 +173,8 @@ def main():
     )
     
     args = parser.parse_args()
+    if args.no_ssplit and args.paragraph_mode:
+        parser.error('--no-ssplit requires one sentence per line and cannot be used with --paragraph-mode')
     
     # Validate input
     if not args.input.exists():
@@ -151,6 +198,8 @@ def main():
     print(f"Processors: tokenize, pos, lemma, depparse")
     print(f"Device: {'GPU (CUDA)' if use_cuda else 'CPU'}")
     print(f"Model token batch size: {args.batch_size}")
+    if args.no_ssplit:
+        print("Sentence splitting: off (one sentence per input line)")
     
     try:
         nlp = stanza.Pipeline(
@@ -165,6 +214,7 @@ def main():
             pos_batch_size=args.batch_size,
             lemma_batch_size=args.batch_size,
             depparse_batch_size=args.batch_size,
+            tokenize_no_ssplit=args.no_ssplit,
         )
     except Exception as e:
         print(f"Error initializing Stanza: {e}", file=sys.stderr)
@@ -177,6 +227,7 @@ def main():
                     verbose=False,
                     use_gpu=False,
                     batch_size=args.batch_size,
+                    tokenize_no_ssplit=args.no_ssplit,
                 )
             except Exception as e2:
                 print(f"Error initializing Stanza on CPU: {e2}", file=sys.stderr)
@@ -194,7 +245,7 @@ def main():
 
     # Process and write output (chunked batching to prevent handle exhaustion)
     print(f"Streaming input: {args.input}")
-    print(f"Chunk size: {args.chunk_size} units per nlp() call, heartbeat every {args.heartbeat} chunks")
+    print(f"Chunk size: {args.chunk_size} units per bulk_process() call, heartbeat every {args.heartbeat} chunks")
 
     def write_doc(doc, f, start_sent_id):
         """Write a processed Stanza doc to CoNLL-U output, return (sentences, tokens) counts."""
@@ -203,66 +254,66 @@ def main():
             sc += 1
             tc += len(sentence.words)
             sent_id = start_sent_id + sc
-            print(f"# sent_id = {sent_id}", file=f)
-            print(f"# text = {sentence.text}", file=f)
-            for word in sentence.words:
-                misc = f"Text={word.text}" if word.text else ""
-                print(
-                    word.id,
-                    word.text,
-                    word.lemma if word.lemma else '_',
-                    word.upos if word.upos else '_',
-                    word.xpos if word.xpos else '_',
-                    word.feats if word.feats else '_',
-                    word.head,
-                    word.deprel if word.deprel else '_',
-                    '_',
-                    misc,
-                    sep='\t',
-                    file=f
-                )
-            print(file=f)  # blank line after each sentence
+            # Build the whole sentence block and write it with one call
+            lines = [f"# sent_id = {sent_id}", f"# text = {sentence.text}"]
+            lines.extend(
+                f"{word.id}\t{word.text}\t{word.lemma or '_'}\t{word.upos or '_'}\t"
+                f"{word.xpos or '_'}\t{word.feats or '_'}\t{word.head}\t{word.deprel or '_'}\t_\t"
+                f"{'Text=' + word.text if word.text else ''}"
+                for word in sentence.words
+            )
+            lines.append('\n')  # blank line after each sentence
+            f.write('\n'.join(lines))
         return sc, tc
 
-    accumulated_lines = []
-    with open(args.output, 'w', encoding='utf-8') as f:
+    # Reading (prefetch thread), tagging (main thread) and writing (writer
+    # thread) overlap: while the GPU tags chunk N, chunk N+1 is read and
+    # chunk N-1 is formatted and written.
+    with open(args.output, 'w', encoding='utf-8', buffering=1 << 20) as f, \
+         ThreadPoolExecutor(max_workers=1) as writer:
         sentence_count = 0
         token_count = 0
         para_count = 0
         chunk_count = 0
+        written_units = 0
+        pending_write = None
+
+        def write_chunk(docs):
+            # Progress is reported here, once the counters include this chunk,
+            # so the main thread never has to wait for the writer to print it
+            nonlocal sentence_count, token_count, written_units
+            for doc in docs:
+                sc, tc = write_doc(doc, f, sentence_count)
+                sentence_count += sc
+                token_count += tc
+            written_units += len(docs)
+            if written_units // args.progress > (written_units - len(docs)) // args.progress:
+                print(f"  Processed {written_units:,} units ({sentence_count:,} sentences, {token_count:,} tokens)...")
 
-        def flush_chunk(chunk, f):
-            nonlocal sentence_count, token_count, chunk_count
-            combined_text = "\n\n".join(chunk)
-            doc = nlp(combined_text)
-            sc, tc = write_doc(doc, f, sentence_count)
-            sentence_count += sc
-            token_count += tc
+        for chunk in prefetch(stream_chunks(args.input, args.paragraph_mode, args.chunk_size)):
+            # One Document per unit, processed together so each model sees
+            # full batches without concatenating the chunk into one huge text
+            docs = nlp.bulk_process([stanza.Document([], text=unit) for unit in chunk])
+            # At most one chunk is waiting to be written; this also re-raises
+            # any error from the writer thread
+            if pending_write is not None:
+                pending_write.result()
+            pending_write = writer.submit(write_chunk, docs)
+            del docs
+
+            para_count += len(chunk)
             chunk_count += 1
-            del doc
 
             if chunk_count % args.heartbeat == 0:
+                pending_write.result()  # writer must be idle before flushing
                 if use_cuda:
                     torch.cuda.empty_cache()
                 gc.collect()
                 f.flush()
                 print(f"  ✓ Heartbeat: {para_count:,} units | {sentence_count:,} sentences | {token_count:,} tokens")
 
-        for para in stream_units(args.input, args.paragraph_mode):
-            accumulated_lines.append(para)
-            para_count += 1
-
-            if len(accumulated_lines) >= args.chunk_size:
-                flush_chunk(accumulated_lines, f)
-                accumulated_lines = []
-
-            if para_count % args.progress == 0:
-                print(f"  Processed {para_count:,} units ({sentence_count:,} sentences, {token_count:,} tokens)...")
-
-        # Flush any remaining units
-        if accumulated_lines:
-            flush_chunk(accumulated_lines, f)
-            accumulated_lines = []
+        if pending_write is not None:
+            pending_write.result()
 
         print(f"\nComplete!")
         print(f"  Paragraphs: {para_count:,}")